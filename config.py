@@ -3,6 +3,7 @@
 # VR output settings
 VR_WIDTH = 2160  # Oculus Rift resolution per eye
 VR_HEIGHT = 1200
+VR_CANVAS_SHAPE = (VR_HEIGHT, 2 * VR_WIDTH, 3)  # Side-by-side canvas shape
 
 # Mount detection settings
 MIN_WINDOW_AREA = 1000  # Minimum area for a valid window
@@ -1,13 +1,40 @@
 """Main script for processing stereo slides to VR format."""
 
 import argparse
+import glob
+import logging
+import multiprocessing
+import os
+import numpy as np
 from utils.image_loader import ImageLoader
 from utils.image_saver import ImageSaver
 from processors.mount_detector import MountDetector
-from processors.noise_reducer import NoiseReducer
+from processors.noise_reducer import NoiseReducer, flush_debug_writes
 from processors.vr_converter import VRConverter
 import config
 
+logger = logging.getLogger(__name__)
+
+# Per-process output canvas, reused across slides so batch runs don't
+# reallocate the full side-by-side VR image for every input
+_vr_canvas = None
+
+def _get_vr_canvas() -> np.ndarray:
+    global _vr_canvas
+    if _vr_canvas is None:
+        _vr_canvas = np.empty(config.VR_CANVAS_SHAPE, dtype=np.uint8)
+    return _vr_canvas
+
+# Per-process saver, reused across slides so batch runs don't spawn a
+# fresh writer thread (and leak it) for every input
+_saver = None
+
+def _get_saver() -> ImageSaver:
+    global _saver
+    if _saver is None:
+        _saver = ImageSaver(output_dir="output")
+    return _saver
+
 def process_slide(
         input_path: str, 
         output_path: str, 
@@ -30,7 +57,7 @@ def process_slide(
     """
     # Initialize components
     loader = ImageLoader()
-    saver = ImageSaver(output_dir="output")
+    saver = _get_saver()
     detector = MountDetector(debug_mode=debug_mode)
     converter = VRConverter(
         target_width=config.VR_WIDTH,
@@ -56,22 +83,36 @@ def process_slide(
                 strength=noise_strength
             )
         
-        # Convert to VR format
-        vr_image = converter.create_vr_image(left_image, right_image)
+        # Convert to VR format, writing into the reusable canvas
+        vr_image = converter.create_vr_image(
+            left_image, right_image, out=_get_vr_canvas())
         
         # Save result
         saver.save_image(vr_image, output_path, create_debug=debug_mode)
-        
-        print(f"Successfully processed {input_path}")
-        print(f"Output saved to {output_path}")
-        
+        saver.flush()
+        if debug_mode:
+            flush_debug_writes()
+
+        logger.info("Successfully processed %s", input_path)
+        logger.info("Output saved to %s", output_path)
+
     except Exception as e:
-        print(f"Error processing slide: {str(e)}")
+        logger.error("Error processing slide %s: %s", input_path, e)
+
+def find_slide_images(input_dir: str) -> list:
+    """Find all slide images in a directory."""
+    files = []
+    for pattern in ("*.jpg", "*.jpeg", "*.png", "*.tif", "*.tiff"):
+        files.extend(glob.glob(os.path.join(input_dir, pattern)))
+    return sorted(files)
 
 def main():
     parser = argparse.ArgumentParser(description="Convert stereo slides to VR format")
-    parser.add_argument("input", help="Input slide image path")
-    parser.add_argument("output", help="Output VR image path")
+    parser.add_argument("input", nargs="?", help="Input slide image path")
+    parser.add_argument("output", nargs="?", help="Output VR image path")
+    parser.add_argument("--input-dir", help="Process every slide image in a directory")
+    parser.add_argument("--jobs", type=int, default=None,
+                      help="Number of worker processes for --input-dir mode")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     parser.add_argument("--noise-reduction", 
                       choices=['bilateral', 'nlm', 'gaussian'],
@@ -88,7 +129,32 @@ def main():
                       help="Remove aging artifacts like fading")
     
     args = parser.parse_args()
-    
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.input_dir:
+        # Fan independent slides out across worker processes; OpenCV
+        # releases the GIL in C code, so scaling is close to linear
+        files = find_slide_images(args.input_dir)
+        if not files:
+            parser.error(f"No slide images found in {args.input_dir}")
+        tasks = [
+            (path,
+             os.path.splitext(os.path.basename(path))[0] + "_vr.jpg",
+             args.debug,
+             args.noise_reduction,
+             args.noise_strength,
+             args.remove_dust,
+             args.remove_aging)
+            for path in files
+        ]
+        with multiprocessing.Pool(args.jobs) as pool:
+            pool.starmap(process_slide, tasks)
+        return
+
+    if not args.input or not args.output:
+        parser.error("input and output are required unless --input-dir is used")
+
     # Call process_slide with keyword arguments
     process_slide(
         input_path=args.input,
@@ -3,15 +3,26 @@
 import cv2
 import numpy as np
 from typing import Tuple, List, Optional
-from dataclasses import dataclass
+from collections import namedtuple
 
-@dataclass
-class Window:
-    x: int
-    y: int
-    width: int
-    height: int
-    image: np.ndarray
+# Lightweight immutable record; avoids per-detection __dict__ allocation
+Window = namedtuple('Window', ['x', 'y', 'width', 'height', 'image'])
+
+def _center_offsets(dims: np.ndarray, target_size: int) -> np.ndarray:
+    """Compute (x, y) offsets that center a target-size square in each rect."""
+    offsets = np.empty_like(dims)
+    for i in range(dims.shape[0]):
+        offsets[i, 0] = (dims[i, 0] - target_size) // 2
+        offsets[i, 1] = (dims[i, 1] - target_size) // 2
+    return offsets
+
+try:
+    # Compile the rect math ahead of time when numba is available; the
+    # plain-Python version above is the fallback
+    from numba import njit
+    _center_offsets = njit(cache=True)(_center_offsets)
+except ImportError:
+    pass
 
 class MountDetector:
     def __init__(self, debug_mode: bool = False):
@@ -23,94 +34,113 @@ class MountDetector:
         self.ASPECT_RATIO_TOL = 0.1
         # Staple removal settings
         self.STAPLE_MARGIN = 15  # Pixels to crop from edges to remove staples
-
-    def remove_staples(self, window_image: np.ndarray) -> np.ndarray:
-        """
-        Remove staple marks by cropping edges of the window.
-        
-        Args:
-            window_image: Extracted window image
-            
-        Returns:
-            np.ndarray: Cleaned window image with staples removed
-        """
-        h, w = window_image.shape[:2]
-        margin = self.STAPLE_MARGIN
-        
-        # Crop out the staple areas
-        cleaned = window_image[margin:h-margin, margin:w-margin]
-        
-        return cleaned
+        # Detection resolution settings
+        self.DETECTION_WIDTH = 1024  # Width used for window detection
+        # Structuring element for cleaning up the binary mask, built once
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+        # Scratch buffers for the preprocessing chain, sized lazily to the
+        # downscaled detection image and reused across calls
+        self._scratch_gray = None
+        self._scratch_blur = None
+        self._scratch_bin = None
 
     def detect_windows(self, image: np.ndarray) -> List[Window]:
         """
         Detect the two square windows in the stereo slide mount.
         Optimized for vintage stereo slides with light-colored mounts.
         """
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Apply strong blur to reduce noise and texture in the mount
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        
-        # Use Otsu's thresholding to find a good threshold value
-        _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        # Invert the image so windows are white
-        binary = cv2.bitwise_not(binary)
-        
-        # Clean up the binary image
-        kernel = np.ones((5,5), np.uint8)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
-        binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
+        # Detection only needs coarse window geometry, so run the whole
+        # pipeline on a downscaled copy and scale the rectangles back up
+        img_height, img_width = image.shape[:2]
+        scale = min(1.0, self.DETECTION_WIDTH / img_width)
+        if scale < 1.0:
+            small = cv2.resize(image, None, fx=scale, fy=scale,
+                               interpolation=cv2.INTER_AREA)
+        else:
+            small = image
+
+        # (Re)build scratch buffers if the detection size changed
+        if self._scratch_gray is None or self._scratch_gray.shape != small.shape[:2]:
+            self._scratch_gray = np.empty(small.shape[:2], np.uint8)
+            self._scratch_blur = np.empty(small.shape[:2], np.uint8)
+            self._scratch_bin = np.empty(small.shape[:2], np.uint8)
+
+        # The light mount vs dark film separates equally well on any single
+        # channel, so take green directly instead of paying the weighted
+        # three-channel grayscale sum
+        gray = cv2.extractChannel(small, 1, dst=self._scratch_gray)
+
+        # Apply strong blur to reduce noise and texture in the mount. A 5x5
+        # box filter is visually equivalent to the Gaussian for Otsu
+        # thresholding and runs as a constant-time sliding sum per pixel
+        blurred = cv2.boxFilter(gray, -1, (5, 5), dst=self._scratch_blur)
+
+        # Use Otsu's thresholding to find a good threshold value, with the
+        # inverted variant so windows come out white in a single pass
+        _, binary = cv2.threshold(blurred, 0, 255,
+                                  cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU,
+                                  dst=self._scratch_bin)
+
+        # Clean up the binary image in place with the precomputed kernel
+        cv2.morphologyEx(binary, cv2.MORPH_CLOSE, self._morph_kernel, dst=binary)
+        cv2.morphologyEx(binary, cv2.MORPH_OPEN, self._morph_kernel, dst=binary)
         
         if self.debug_mode:
             cv2.imwrite('debug_binary.jpg', binary)
         
-        # Find contours
-        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        # Get image dimensions for relative size calculations
-        img_height, img_width = image.shape[:2]
-        min_window_size = int(img_width * self.MIN_WINDOW_RATIO)
-        max_window_size = int(img_width * self.MAX_WINDOW_RATIO)
-        
-        # Filter and sort windows
+        # Label connected blobs in one C pass; stats already holds the
+        # bounding rect and area of every blob, so no Python-level contour
+        # iteration is needed
+        _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        stats = stats[1:]  # Row 0 is the background component
+
+        # Size limits are relative to the downscaled width
+        small_width = small.shape[1]
+        min_window_size = int(small_width * self.MIN_WINDOW_RATIO)
+        max_window_size = int(small_width * self.MAX_WINDOW_RATIO)
+
+        # Vectorized filter: keep nearly-square blobs within the size range
+        w_arr = stats[:, cv2.CC_STAT_WIDTH]
+        h_arr = stats[:, cv2.CC_STAT_HEIGHT]
+        mask = ((w_arr > min_window_size) & (w_arr < max_window_size) &
+                (h_arr > min_window_size) & (h_arr < max_window_size) &
+                (np.abs(1 - w_arr / h_arr) < self.ASPECT_RATIO_TOL))
+        candidates = stats[mask]
+
+        # The two mount windows are the largest surviving blobs
+        order = np.argsort(candidates[:, cv2.CC_STAT_AREA])[::-1][:2]
+        candidates = candidates[order]
+
         windows = []
-        for contour in contours:
-            # Approximate the contour to a polygon
-            epsilon = 0.02 * cv2.arcLength(contour, True)
-            approx = cv2.approxPolyDP(contour, epsilon, True)
-            
-            # Get the rectangle bounding the contour
-            x, y, w, h = cv2.boundingRect(approx)
-            
-            # Calculate aspect ratio and area
-            aspect_ratio = w / h
-            aspect_ratio_error = abs(1 - aspect_ratio)  # How far from square
-            
-            # Filtering criteria
-            if (min_window_size < w < max_window_size and  # Width in range
-                min_window_size < h < max_window_size and  # Height in range
-                aspect_ratio_error < self.ASPECT_RATIO_TOL):  # Nearly square
-                
-                # Extract window image
-                window_image = image[y:y+h, x:x+w]
-                
-                # Remove staples
-                cleaned_image = self.remove_staples(window_image)
-                
-                # Update dimensions after staple removal
-                h_cleaned, w_cleaned = cleaned_image.shape[:2]
-                
-                windows.append(Window(
-                    x + self.STAPLE_MARGIN,  # Adjust coordinates for cropped margins
-                    y + self.STAPLE_MARGIN,
-                    w_cleaned,
-                    h_cleaned,
-                    cleaned_image
-                ))
-        
+        for x, y, w, h in candidates[:, :4]:
+            # Scale the rectangle back to full-resolution coordinates
+            if scale < 1.0:
+                x = int(round(x / scale))
+                y = int(round(y / scale))
+                w = int(round(w / scale))
+                h = int(round(h / scale))
+                x = min(x, img_width - 1)
+                y = min(y, img_height - 1)
+                w = min(w, img_width - x)
+                h = min(h, img_height - y)
+
+            # Crop the window from the full-resolution scan, shrinking
+            # by the staple margin in the same slice so no intermediate
+            # view or extra allocation is created
+            m = self.STAPLE_MARGIN
+            cleaned_image = np.ascontiguousarray(
+                image[y+m:y+h-m, x+m:x+w-m]
+            )
+            h_cleaned, w_cleaned = cleaned_image.shape[:2]
+
+            windows.append(Window(
+                int(x) + m,  # Adjust coordinates for cropped margins
+                int(y) + m,
+                w_cleaned,
+                h_cleaned,
+                cleaned_image
+            ))
+
         # Sort windows left to right
         windows.sort(key=lambda w: w.x)
         
@@ -130,18 +160,17 @@ class MountDetector:
         if len(windows) != 2:
             raise ValueError(f"Expected 2 windows, found {len(windows)}")
         
-        # Use the smaller dimension to ensure we don't exceed either window's bounds
-        target_size = min(
-            min(w.width for w in windows),
-            min(w.height for w in windows)
-        )
-        
+        # Use the smaller dimension to ensure we don't exceed either window's
+        # bounds; one vectorized pass over the packed dimensions
+        dims = np.array([(w.width, w.height) for w in windows], dtype=np.int32)
+        target_size = int(dims.min())
+        offsets = _center_offsets(dims, target_size)
+
         standardized = []
-        for window in windows:
-            # Calculate centering offsets
-            x_offset = (window.width - target_size) // 2
-            y_offset = (window.height - target_size) // 2
-            
+        for window, (x_offset, y_offset) in zip(windows, offsets):
+            x_offset = int(x_offset)
+            y_offset = int(y_offset)
+
             # Extract centered square region
             centered = window.image[
                 y_offset:y_offset+target_size,
@@ -2,19 +2,101 @@
 
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _build_barrel_maps(rows: int, cols: int,
+                           center_x: float, center_y: float,
+                           strength: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute barrel-distortion coordinate maps in one fused pass.
+
+        Uses the identity r_d*cos(atan2(dy,dx)) == dx*(1 + s*(r/cx)**2),
+        so the distortion is a pure radial scale and no transcendentals
+        are needed; everything stays in registers per pixel.
+        """
+        map_x = np.empty((rows, cols), np.float32)
+        map_y = np.empty((rows, cols), np.float32)
+        factor = strength / (center_x * center_x)
+        for i in prange(rows):
+            dy = i - center_y
+            for j in range(cols):
+                dx = j - center_x
+                scale = 1.0 + (dx * dx + dy * dy) * factor
+                map_x[i, j] = center_x + dx * scale
+                map_y[i, j] = center_y + dy * scale
+        return map_x, map_y
+
+except ImportError:
+    def _build_barrel_maps(rows: int, cols: int,
+                           center_x: float, center_y: float,
+                           strength: float) -> Tuple[np.ndarray, np.ndarray]:
+        """NumPy fallback for the barrel-distortion coordinate maps.
+
+        The distortion is a pure radial scale: since
+        cos(atan2(dy, dx)) == dx/r, the polar round trip collapses to
+        multiplying each offset by 1 + s*(r/cx)**2, with no sqrt,
+        arctan2, cos or sin.
+        """
+        y, x = np.mgrid[0:rows, 0:cols]
+        x = x.astype(np.float32) - center_x
+        y = y.astype(np.float32) - center_y
+
+        # Radial scale factor (isotropic, normalized by center_x as before)
+        scale = 1 + strength * (x * x + y * y) / (center_x * center_x)
+
+        x_distorted = center_x + x * scale
+        y_distorted = center_y + y * scale
+
+        return x_distorted.astype(np.float32), y_distorted.astype(np.float32)
+
 class VRConverter:
-    def __init__(self, target_width: int = 2160, target_height: int = 1200):
+    def __init__(self,
+                 target_width: int = 2160,
+                 target_height: int = 1200,
+                 distortion_strength: float = 0.6):
         """
         Initialize the VR converter.
-        
+
         Args:
             target_width: Width of each eye's view in pixels
             target_height: Height of each eye's view in pixels
+            distortion_strength: Barrel distortion strength (0.0 to 1.0)
         """
         self.target_width = target_width
         self.target_height = target_height
+        self.distortion_strength = distortion_strength
+        # Pool for processing the two eyes concurrently; remap/resize
+        # release the GIL inside OpenCV
+        self._pair_pool = ThreadPoolExecutor(max_workers=2)
+        # Pool for overlapping whole pairs in batch mode, built on demand
+        self._batch_pool = None
+        # Side-by-side canvas shape, and a default canvas of it reused
+        # whenever the caller doesn't supply one; at 60-90 fps the
+        # per-frame hstack allocation was around a gigabyte per second
+        # of pure memory traffic
+        self._canvas_shape = (target_height, 2 * target_width, 3)
+        self._out = np.empty(self._canvas_shape, np.uint8)
+        # The distortion maps depend only on image size and strength, so
+        # build them once for the target size; remap is then the only
+        # per-image work. The fixed-point CV_16SC2 layout halves the
+        # coordinate bandwidth and hits OpenCV's integer bilerp path.
+        self._map_key = None
+        self._map1 = None
+        self._map2 = None
+        self._ensure_maps(target_height, target_width, distortion_strength)
+
+    def _ensure_maps(self, rows: int, cols: int, strength: float):
+        """Build and cache the fixed-point remap tables if stale."""
+        key = (rows, cols, strength)
+        if key != self._map_key:
+            map_x, map_y = _build_barrel_maps(rows, cols,
+                                              cols / 2, rows / 2, strength)
+            self._map1, self._map2 = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+            self._map_key = key
 
     def resize_for_vr(self, image: np.ndarray) -> np.ndarray:
         """
@@ -28,70 +110,99 @@ class VRConverter:
         """
         return cv2.resize(image, (self.target_width, self.target_height))
 
-    def apply_barrel_distortion(self, 
-                              image: np.ndarray, 
-                              strength: float = 0.6) -> np.ndarray:
+    def apply_barrel_distortion(self,
+                              image: np.ndarray,
+                              strength: float = None) -> np.ndarray:
         """
         Apply barrel distortion correction for VR viewing.
-        
+
         Args:
             image: Input image
-            strength: Distortion strength (0.0 to 1.0)
-            
+            strength: Distortion strength (0.0 to 1.0); defaults to the
+                strength the converter was constructed with
+
         Returns:
             np.ndarray: Distortion-corrected image
         """
+        if strength is None:
+            strength = self.distortion_strength
         rows, cols = image.shape[:2]
-        center_x = cols / 2
-        center_y = rows / 2
-        
-        # Create coordinate maps
-        y, x = np.mgrid[0:rows, 0:cols]
-        x = x.astype(np.float32) - center_x
-        y = y.astype(np.float32) - center_y
-        
-        # Calculate radius and normalized coordinates
-        r = np.sqrt(x**2 + y**2)
-        theta = np.arctan2(y, x)
-        
-        # Apply distortion
-        r_distorted = r * (1 + strength * (r / center_x)**2)
-        
-        # Convert back to Cartesian coordinates
-        x_distorted = center_x + r_distorted * np.cos(theta)
-        y_distorted = center_y + r_distorted * np.sin(theta)
-        
-        # Remap image
-        return cv2.remap(
-            image,
-            x_distorted.astype(np.float32),
-            y_distorted.astype(np.float32),
-            cv2.INTER_LINEAR
-        )
-
-    def create_vr_image(self, 
-                       left_image: np.ndarray, 
+        self._ensure_maps(rows, cols, strength)
+
+        # Remap image using the cached fixed-point maps
+        return cv2.remap(image, self._map1, self._map2, cv2.INTER_LINEAR,
+                         borderMode=cv2.BORDER_REPLICATE)
+
+    def create_vr_image(self,
+                       left_image: np.ndarray,
                        right_image: np.ndarray,
-                       apply_distortion: bool = True) -> np.ndarray:
+                       apply_distortion: bool = True,
+                       out: np.ndarray = None) -> np.ndarray:
         """
         Create VR-ready image from stereo pair.
-        
+
         Args:
             left_image: Left eye image
             right_image: Right eye image
             apply_distortion: Whether to apply barrel distortion
-            
+            out: Optional preallocated (height, 2*width, 3) uint8 canvas;
+                defaults to the converter's own reusable canvas, which
+                stays valid until the next call
+
         Returns:
             np.ndarray: VR-ready image
         """
-        # Resize images
-        left_vr = self.resize_for_vr(left_image)
-        right_vr = self.resize_for_vr(right_image)
-        
-        # Apply barrel distortion if requested
+        if out is None:
+            out = self._out
+        self._ensure_maps(self.target_height, self.target_width,
+                          self.distortion_strength)
+
+        # Render each eye directly into its half of the canvas, one eye
+        # per worker; writing through the views removes the hstack copy
+        future_left = self._pair_pool.submit(
+            self._render_eye, left_image,
+            out[:, :self.target_width], apply_distortion)
+        future_right = self._pair_pool.submit(
+            self._render_eye, right_image,
+            out[:, self.target_width:], apply_distortion)
+        future_left.result()
+        future_right.result()
+
+        return out
+
+    def _render_eye(self,
+                    image: np.ndarray,
+                    dst: np.ndarray,
+                    apply_distortion: bool):
+        """Resize one eye and write the (optionally distorted) result to dst."""
         if apply_distortion:
-            left_vr = self.apply_barrel_distortion(left_vr)
-            right_vr = self.apply_barrel_distortion(right_vr)
-        
-        # Combine images side by side
-        return np.hstack((left_vr, right_vr))
+            resized = self.resize_for_vr(image)
+            cv2.remap(resized, self._map1, self._map2, cv2.INTER_LINEAR,
+                      dst=dst, borderMode=cv2.BORDER_REPLICATE)
+        else:
+            cv2.resize(image, (self.target_width, self.target_height), dst=dst)
+
+    def create_vr_image_batch(self,
+                              pairs: list,
+                              apply_distortion: bool = True) -> list:
+        """
+        Convert several stereo pairs, overlapping work across pairs.
+
+        Args:
+            pairs: List of (left_image, right_image) tuples
+            apply_distortion: Whether to apply barrel distortion
+
+        Returns:
+            list: VR-ready images, one per input pair
+        """
+        if self._batch_pool is None:
+            self._batch_pool = ThreadPoolExecutor(max_workers=2)
+        # Each in-flight pair needs its own canvas, so don't default to
+        # the shared one here
+        futures = [
+            self._batch_pool.submit(
+                self.create_vr_image, left, right, apply_distortion,
+                np.empty(self._canvas_shape, np.uint8))
+            for left, right in pairs
+        ]
+        return [future.result() for future in futures]
@@ -1,11 +1,20 @@
 """Utility functions for saving processed images and debug output."""
 
+import logging
 import os
+import queue
+import threading
 import cv2
 import numpy as np
 from datetime import datetime
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+# WebP halves the bytes of a quality-matched JPEG, which matters on the
+# headset's WiFi link far more than encode time does on the desktop
+_WEBP_PARAMS = [cv2.IMWRITE_WEBP_QUALITY, 85]
+
 class ImageSaver:
     def __init__(self, output_dir: str = "output"):
         """
@@ -15,18 +24,57 @@ class ImageSaver:
             output_dir: Directory to save output files
         """
         self.output_dir = output_dir
-        self._ensure_output_dir()
-    
-    def _ensure_output_dir(self):
-        """Create output directory if it doesn't exist."""
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
-            
+        self._ensured_dirs = set()
+        # Write-behind queue drained by one daemon thread, so saves
+        # overlap with the next slide's processing and throughput is
+        # bounded by max(compute, write) instead of their sum
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+    def _ensure_dir(self, path: str):
+        """Create a directory once and remember it to skip repeat stat calls."""
+        if path not in self._ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._ensured_dirs.add(path)
+
     def _generate_filename(self, prefix: str, suffix: str) -> str:
         """Generate a unique filename with timestamp."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return f"{prefix}_{timestamp}{suffix}"
-    
+
+    def _encode(self, filename: str, image: np.ndarray) -> bytes:
+        """Encode an image once into the format implied by its extension."""
+        ext = os.path.splitext(filename)[1].lower()
+        params = [cv2.IMWRITE_JPEG_QUALITY, 90] if ext in ('.jpg', '.jpeg') else []
+        success, buf = cv2.imencode(ext, image, params)
+        if not success:
+            raise ValueError(f"Failed to encode image: {filename}")
+        return buf.tobytes()
+
+    def _write(self, filepath: str, data: bytes):
+        """Write pre-encoded image bytes on a worker thread."""
+        try:
+            with open(filepath, 'wb', buffering=1 << 20) as f:
+                f.write(data)
+        except Exception as e:
+            logger.error("Error saving image: %s", e)
+
+    def _writer_loop(self):
+        """Drain queued writes on the background thread."""
+        while True:
+            filepath, data = self._queue.get()
+            self._write(filepath, data)
+            self._queue.task_done()
+
+    def _submit_write(self, filepath: str, data: bytes):
+        """Queue an image write for the background writer."""
+        self._queue.put((filepath, data))
+
+    def flush(self):
+        """Wait for all queued writes to finish."""
+        self._queue.join()
+
     def save_image(self, 
                   image: np.ndarray, 
                   filename: str,
@@ -47,26 +95,35 @@ class ImageSaver:
             if not filename.lower().endswith(('.png', '.jpg', '.jpeg')):
                 filename += '.jpg'
                 
+            self._ensure_dir(self.output_dir)
             filepath = os.path.join(self.output_dir, filename)
-            success = cv2.imwrite(filepath, image)
-            
-            if not success:
-                raise ValueError(f"Failed to save image: {filepath}")
-                
-            # Save debug copy if requested
+            data = self._encode(filename, image)
+            self._submit_write(filepath, data)
+
+            # Also emit a WebP sibling when the build supports it; the
+            # viewer serves it to clients that advertise image/webp
+            try:
+                success, webp_buf = cv2.imencode('.webp', image, _WEBP_PARAMS)
+            except cv2.error:
+                success = False
+            if success:
+                webp_name = os.path.splitext(filename)[0] + '.webp'
+                self._submit_write(os.path.join(self.output_dir, webp_name),
+                                   webp_buf.tobytes())
+
+            # Save debug copy if requested, reusing the encoded bytes
             if create_debug:
                 debug_dir = os.path.join(self.output_dir, "debug")
-                if not os.path.exists(debug_dir):
-                    os.makedirs(debug_dir)
-                    
+                self._ensure_dir(debug_dir)
+
                 debug_filename = self._generate_filename("debug", os.path.splitext(filename)[1])
                 debug_filepath = os.path.join(debug_dir, debug_filename)
-                cv2.imwrite(debug_filepath, image)
-                
+                self._submit_write(debug_filepath, data)
+
             return filepath
             
         except Exception as e:
-            print(f"Error saving image: {str(e)}")
+            logger.error("Error saving image: %s", e)
             return None
     
     def save_debug_image(self, 
@@ -82,10 +139,10 @@ class ImageSaver:
         Returns:
             str: Path to saved debug file if successful, None otherwise
         """
+        self._ensure_dir(self.output_dir)
         debug_dir = os.path.join(self.output_dir, "debug")
-        if not os.path.exists(debug_dir):
-            os.makedirs(debug_dir)
-            
+        self._ensure_dir(debug_dir)
+
         filename = self._generate_filename(f"debug_{description}", ".jpg")
         filepath = os.path.join(debug_dir, filename)
         
@@ -95,5 +152,5 @@ class ImageSaver:
                 raise ValueError(f"Failed to save debug image: {filepath}")
             return filepath
         except Exception as e:
-            print(f"Error saving debug image: {str(e)}")
+            logger.error("Error saving debug image: %s", e)
             return None
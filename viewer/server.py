@@ -1,23 +1,48 @@
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import socket
 import os
 
+class ViewerServer(ThreadingHTTPServer):
+    """Threaded server so the headset's parallel asset fetches don't queue."""
+    # Don't block shutdown on in-flight requests
+    daemon_threads = True
+    # Allow immediate restart without waiting out TIME_WAIT
+    allow_reuse_address = True
+
+class ViewerRequestHandler(SimpleHTTPRequestHandler):
+    """Serves WebP siblings of images to clients that accept them."""
+
+    def do_GET(self):
+        base, ext = os.path.splitext(self.path)
+        if (ext.lower() in ('.jpg', '.jpeg', '.png')
+                and 'image/webp' in self.headers.get('Accept', '')):
+            webp_path = base + '.webp'
+            if os.path.exists(self.translate_path(webp_path)):
+                self.path = webp_path
+        super().do_GET()
+
+# Cached result; resolving the default-route interface costs a socket
+# and shouldn't repeat if the server is restarted in a reload loop
+_LOCAL_IP = None
+
 def get_local_ip():
-    """Get the local IP address of the machine"""
-    try:
-        # Create a socket to get local IP
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))  # Doesn't actually connect
-        local_ip = s.getsockname()[0]
-        s.close()
-        return local_ip
-    except:
-        return "Could not determine IP"
+    """Get the local IP address of the machine (cached after first call)"""
+    global _LOCAL_IP
+    if _LOCAL_IP is None:
+        try:
+            # Create a socket to get local IP
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.connect(("8.8.8.8", 80))  # Doesn't actually connect
+            _LOCAL_IP = s.getsockname()[0]
+            s.close()
+        except OSError:
+            _LOCAL_IP = "Could not determine IP"
+    return _LOCAL_IP
 
 def start_server(port=8000):
     # Bind to all available interfaces
     server_address = ('0.0.0.0', port)
-    httpd = HTTPServer(server_address, SimpleHTTPRequestHandler)
+    httpd = ViewerServer(server_address, ViewerRequestHandler)
     
     local_ip = get_local_ip()
     